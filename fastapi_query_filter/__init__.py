@@ -1,35 +1,45 @@
 import typing
+from types import MappingProxyType
 
 from sqlalchemy.sql import Select
 
 from .utils.iter import group_by
 from .definition import (
     BaseDeclarativeFilter,
+    CompiledFilter,
     FilterType,
 )
 from .query import QueryType
+from .relationship import RelationshipPath, RelationshipPlan, RelationshipStrategy
 from .types import SqlQueryFilterType, QueryFilterOperators
 from .validation import QueryFilterValidator
 
 
 class SqlQueryFilterFacade:
-    _orm_operator_transformer = {
-        QueryFilterOperators.NOT_EQ: lambda value: ("__ne__", value),
-        QueryFilterOperators.EQ: lambda value: ("__eq__", value),
-        QueryFilterOperators.GT: lambda value: ("__gt__", value),
-        QueryFilterOperators.GE: lambda value: ("__ge__", value),
-        QueryFilterOperators.IN: lambda value: ("in_", value),
-        QueryFilterOperators.IS_NULL: lambda value: ("is_", None)
-        if value is True
-        else ("is_not", None),
-        QueryFilterOperators.LT: lambda value: ("__lt__", value),
-        QueryFilterOperators.LE: lambda value: ("__le__", value),
-        QueryFilterOperators.LIKE: lambda value: ("like", f"%{value}%"),
-        QueryFilterOperators.ILIKE: lambda value: ("ilike", f"%{value}%"),
-        QueryFilterOperators.NOT: lambda value: ("is_not", value),
-        QueryFilterOperators.NOT_IN: lambda value: ("not_in", value),
-        QueryFilterOperators.OPTION: lambda value: ("", value),
-    }
+    """
+    Query filter facade. It's created per request and must not be shared between threads,
+    while filter definition and operator transformer are read-only and shared safely.
+    """
+
+    _orm_operator_transformer = MappingProxyType(
+        {
+            QueryFilterOperators.NOT_EQ: lambda value: ("__ne__", value),
+            QueryFilterOperators.EQ: lambda value: ("__eq__", value),
+            QueryFilterOperators.GT: lambda value: ("__gt__", value),
+            QueryFilterOperators.GE: lambda value: ("__ge__", value),
+            QueryFilterOperators.IN: lambda value: ("in_", value),
+            QueryFilterOperators.IS_NULL: lambda value: ("is_", None)
+            if value is True
+            else ("is_not", None),
+            QueryFilterOperators.LT: lambda value: ("__lt__", value),
+            QueryFilterOperators.LE: lambda value: ("__le__", value),
+            QueryFilterOperators.LIKE: lambda value: ("like", f"%{value}%"),
+            QueryFilterOperators.ILIKE: lambda value: ("ilike", f"%{value}%"),
+            QueryFilterOperators.NOT: lambda value: ("is_not", value),
+            QueryFilterOperators.NOT_IN: lambda value: ("not_in", value),
+            QueryFilterOperators.OPTION: lambda value: ("", value),
+        }
+    )
 
     def __init__(
         self,
@@ -48,6 +58,10 @@ class SqlQueryFilterFacade:
         self.fields = self._extract_model_fields()
 
     def _extract_model_fields(self):
+        """
+        Returns model fields of filter definition. Relationship fields are returned
+        as ``RelationshipPath``, use ``RelationshipPlan.get_column`` for joined column.
+        """
         return {
             field_name: field_metadata.model_field
             for field_name, field_metadata in self.defined_filter.query_fields.items()
@@ -88,15 +102,35 @@ class SqlQueryFilterFacade:
             )
         return base_stmt
 
+    def plan(
+        self,
+        exclude_fields: typing.Optional[typing.Set[str]] = None,
+    ) -> RelationshipPlan:
+        """
+        Plan joins and EXISTS subqueries for passed query fields.
+        """
+        exclude_fields = exclude_fields or set()
+        paths = {
+            query.field: self.defined_filter.query_fields[query.field].relationship_path
+            for query in self.queries
+            if query.field not in exclude_fields
+            and query.field in self.defined_filter.query_fields
+        }
+        return RelationshipPlan(paths)
+
     def apply(
         self,
         base_stmt: Select,
         exclude_fields: typing.Optional[typing.Set[str]] = None,
+        plan: typing.Optional[RelationshipPlan] = None,
     ) -> Select:
         """
         Apply query filter to base statement.
+        Pass own plan to reuse its joined columns in statement afterwards.
         """
         exclude_fields = exclude_fields or set()
+        plan = plan or self.plan(exclude_fields)
+        base_stmt = plan.apply_joins(base_stmt)
         for query in self.queries:
             if query.field in exclude_fields:
                 continue
@@ -110,14 +144,22 @@ class SqlQueryFilterFacade:
             if query_field_metadata.query_type is QueryType.Option:
                 _, value = self._get_orm_operator(query.operator, query.value)
                 if value:
-                    expression = query_field_metadata.model_field
+                    expression = plan.resolve(
+                        query.field,
+                        query_field_metadata,
+                        lambda model_field: model_field,
+                    )
                     base_stmt = self._apply_expression(
                         base_stmt, expression, query_field_metadata
                     )
             else:
                 operator, value = self._get_orm_operator(query.operator, query.value)
-                expression = self._get_orm_expression(
-                    query_field_metadata.model_field, operator, value
+                expression = plan.resolve(
+                    query.field,
+                    query_field_metadata,
+                    lambda model_field: self._get_orm_expression(
+                        model_field, operator, value
+                    ),
                 )
                 base_stmt = self._apply_expression(
                     base_stmt, expression, query_field_metadata
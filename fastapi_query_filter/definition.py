@@ -1,8 +1,12 @@
+import os
+import threading
 import typing
 from collections import defaultdict
 from enum import Enum, auto
+from types import MappingProxyType
 
 from .query import BaseQuery
+from .relationship import RelationshipPath
 from .types import ValidatorHandler, Validator
 
 
@@ -14,6 +18,9 @@ class FilterType(Enum):
 class QueryField:
     """
     Query filter field metadata. It's used for filter definition.
+
+    Model field may be a column or relationship path: ``RelationshipPath`` instance
+    or tuple of attributes, e.g. ``(Order.customer, Customer.country)``.
     """
 
     def __init__(
@@ -23,6 +30,13 @@ class QueryField:
         value_type: typing.Type,
         filter_type: FilterType = FilterType.WHERE,
     ):
+        if isinstance(model_field, (tuple, list)):
+            model_field = RelationshipPath(*model_field)
+
+        self.relationship_path: typing.Optional[RelationshipPath] = None
+        if isinstance(model_field, RelationshipPath):
+            self.relationship_path = model_field
+
         self.model_field = model_field
         self.filter_type = filter_type
 
@@ -30,27 +44,103 @@ class QueryField:
         self.value_type = value_type
 
 
+class CompiledFilter:
+    """
+    Immutable reflected filter definition.
+
+    It's built once per filter class and shared by all its instances, so it's safe
+    to use from many threads. Immutability is shallow: mappings are read-only, but
+    ``QueryField`` objects inside them are shared by every instance and subclass
+    and must not be modified.
+
+    To share it between forked workers (e.g. gunicorn ``preload_app``), compile
+    filters in preload step and call ``gc.freeze()`` before workers are forked,
+    otherwise refcount updates and GC passes copy touched pages anyway.
+    """
+
+    __slots__ = ("query_fields", "query_fields_validators")
+
+    def __init__(
+        self,
+        query_fields: typing.Mapping[str, QueryField],
+        query_fields_validators: typing.Mapping[str, typing.Tuple[ValidatorHandler, ...]],
+    ):
+        object.__setattr__(self, "query_fields", MappingProxyType(dict(query_fields)))
+        object.__setattr__(
+            self,
+            "query_fields_validators",
+            MappingProxyType(dict(query_fields_validators)),
+        )
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+
+_compile_lock = threading.Lock()
+
+
+def _reset_compile_lock():
+    """
+    Replace lock in forked child, it may be held by thread which doesn't exist there.
+    """
+    global _compile_lock
+    _compile_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_compile_lock)
+
+
 class BaseDeclarativeFilter:
+    _compiled_filter: typing.ClassVar[typing.Optional[CompiledFilter]] = None
+
     def __init__(self):
-        self._user_defined_fields = self._get_user_defined_fields()
-        self.query_fields = self._get_defined_query_fields(self._user_defined_fields)
-        self.query_fields_validators = self._get_defined_query_validators(
-            self._user_defined_fields
-        )
+        compiled = self.compile()
+        self.query_fields = compiled.query_fields
+        self.query_fields_validators = compiled.query_fields_validators
+
+    @classmethod
+    def compile(cls) -> CompiledFilter:
+        """
+        Returns compiled filter definition. It's built only once per filter class.
+        """
+        compiled = cls.__dict__.get("_compiled_filter", None)
+        if compiled is not None:
+            return compiled
+
+        with _compile_lock:
+            compiled = cls.__dict__.get("_compiled_filter", None)
+            if compiled is None:
+                user_defined_fields = cls._get_user_defined_fields()
+                query_fields = cls._get_defined_query_fields(user_defined_fields)
+                for query_field in query_fields.values():
+                    if query_field.relationship_path is not None:
+                        query_field.relationship_path.resolve()
+                compiled = CompiledFilter(
+                    query_fields,
+                    cls._get_defined_query_validators(user_defined_fields),
+                )
+                cls._compiled_filter = compiled
+        return compiled
 
-    def _get_user_defined_fields(self) -> typing.Dict[str, typing.Any]:
+    @classmethod
+    def _get_user_defined_fields(cls) -> typing.Dict[str, typing.Any]:
         """
         Returns user defined class fields.
         """
         return {
-            attr_name: self.__class__.__dict__[attr_name]
-            for attr_name in dir(self.__class__)
+            attr_name: getattr(cls, attr_name)
+            for attr_name in dir(cls)
             if not attr_name.startswith("_")
         }
 
+    @classmethod
     def _get_defined_query_validators(
-        self, user_defined_fields
-    ) -> typing.DefaultDict[str, typing.List[ValidatorHandler]]:
+        cls, user_defined_fields
+    ) -> typing.Dict[str, typing.Tuple[ValidatorHandler, ...]]:
         """
         Returns defined query validators.
         """
@@ -64,10 +154,13 @@ class BaseDeclarativeFilter:
             field_name, func = validator
             query_validators[field_name].append(func)
 
-        return query_validators
+        return {
+            field_name: tuple(funcs) for field_name, funcs in query_validators.items()
+        }
 
+    @classmethod
     def _get_defined_query_fields(
-        self, user_defined_fields
+        cls, user_defined_fields
     ) -> typing.Dict[str, QueryField]:
         return {
             field_name: field_value
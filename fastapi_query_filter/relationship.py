@@ -0,0 +1,243 @@
+"""
+Relationship paths and JOIN/EXISTS planning for query filter fields.
+"""
+import typing
+from enum import Enum, auto
+
+from sqlalchemy.orm import RelationshipProperty, aliased
+from sqlalchemy.sql import Select
+
+JoinKey = typing.Tuple[typing.Any, ...]
+ConditionBuilder = typing.Callable[[typing.Any], typing.Any]
+
+
+class RelationshipStrategy(Enum):
+    COLUMN = auto()
+    JOIN = auto()
+    EXISTS = auto()
+
+
+def _is_relationship(attribute) -> bool:
+    return isinstance(getattr(attribute, "property", None), RelationshipProperty)
+
+
+class _ResolvedPath(typing.NamedTuple):
+    root: typing.Any
+    relationships: typing.Tuple[typing.Any, ...]
+    column: typing.Any
+    split_index: int
+
+
+class RelationshipPath:
+    """
+    Path from root model to column through relationships.
+
+    Leading to-one relationships are joined, everything from the first
+    to-many relationship is filtered through EXISTS subquery, so rows
+    of root model are never multiplied.
+
+    Path is resolved lazily on first use, because inspecting relationships
+    configures all mappers of registry and filters are defined at import time.
+    """
+
+    def __init__(
+        self,
+        *attributes,
+        _lookup: typing.Optional[typing.Tuple[typing.Any, typing.List[str]]] = None,
+    ):
+        if _lookup is None and len(attributes) < 2:
+            raise ValueError("Relationship path must contain relationship and column")
+
+        self._attributes: typing.Tuple[typing.Any, ...] = attributes
+        self._lookup = _lookup
+        self._resolved: typing.Optional[_ResolvedPath] = None
+
+    @classmethod
+    def from_string(cls, model, path: str) -> "RelationshipPath":
+        """
+        Build path from dotted string, e.g. ``from_string(Order, "customer.country")``.
+        """
+        attr_names = path.split(".")
+        if len(attr_names) < 2:
+            raise ValueError("Relationship path must contain relationship and column")
+
+        return cls(_lookup=(model, attr_names))
+
+    def _lookup_attributes(self) -> typing.Tuple[typing.Any, ...]:
+        if self._lookup is None:
+            return self._attributes
+
+        model, attr_names = self._lookup
+        attributes = []
+        current = model
+        for attr_name in attr_names:
+            attribute = getattr(current, attr_name, None)
+            if attribute is None:
+                raise ValueError(f"'{current.__name__}' has no attribute '{attr_name}'")
+            attributes.append(attribute)
+            if _is_relationship(attribute):
+                current = attribute.property.mapper.class_
+        return tuple(attributes)
+
+    def resolve(self) -> _ResolvedPath:
+        """
+        Validate path and split it into joined and EXISTS parts. Result is cached.
+        """
+        # concurrent first calls compute the same value, so race is harmless
+        if self._resolved is not None:
+            return self._resolved
+
+        attributes = self._lookup_attributes()
+        *relationships, column = attributes
+        for relationship in relationships:
+            if not _is_relationship(relationship):
+                raise ValueError(f"Path part '{relationship}' is not a relationship")
+        if _is_relationship(column):
+            raise ValueError(f"Path must end with column, got relationship '{column}'")
+
+        for relationship, next_attribute in zip(relationships, attributes[1:]):
+            target = relationship.property.mapper.class_
+            if not issubclass(next_attribute.class_, target):
+                raise ValueError(
+                    f"Path part '{next_attribute}' does not belong to '{target.__name__}'"
+                )
+
+        split_index = next(
+            (
+                index
+                for index, relationship in enumerate(relationships)
+                if relationship.property.uselist
+            ),
+            len(relationships),
+        )
+        self._resolved = _ResolvedPath(
+            relationships[0].class_, tuple(relationships), column, split_index
+        )
+        return self._resolved
+
+    @property
+    def root(self):
+        return self.resolve().root
+
+    @property
+    def relationships(self) -> typing.Tuple[typing.Any, ...]:
+        return self.resolve().relationships
+
+    @property
+    def column(self):
+        return self.resolve().column
+
+    @property
+    def join_relationships(self) -> typing.Tuple[typing.Any, ...]:
+        """
+        To-one relationships which are joined.
+        """
+        return self.relationships[: self.resolve().split_index]
+
+    @property
+    def exists_relationships(self) -> typing.Tuple[typing.Any, ...]:
+        """
+        Relationships which are filtered through EXISTS subquery.
+        """
+        return self.relationships[self.resolve().split_index :]
+
+    @property
+    def strategy(self) -> RelationshipStrategy:
+        if self.exists_relationships:
+            return RelationshipStrategy.EXISTS
+        return RelationshipStrategy.JOIN
+
+    def join_keys(self) -> typing.List[JoinKey]:
+        """
+        Returns keys of every joined prefix: (root, "customer"), (root, "customer", "address"), ...
+        """
+        keys = []
+        key: JoinKey = (self.root,)
+        for relationship in self.join_relationships:
+            key = key + (relationship.key,)
+            keys.append(key)
+        return keys
+
+    def __str__(self) -> str:
+        names = [relationship.key for relationship in self.relationships]
+        return ".".join([self.root.__name__, *names, self.column.key])
+
+
+class RelationshipPlan:
+    """
+    Minimal set of joins shared between relationship paths of filter fields.
+    """
+
+    def __init__(self, paths: typing.Dict[str, typing.Optional[RelationshipPath]]):
+        self.paths = paths
+        self.strategies: typing.Dict[str, RelationshipStrategy] = {
+            field_name: RelationshipStrategy.COLUMN if path is None else path.strategy
+            for field_name, path in paths.items()
+        }
+
+        self._joins: typing.Dict[JoinKey, typing.Tuple[typing.Any, typing.Any]] = {}
+        for path in paths.values():
+            if path is None:
+                continue
+            for key, relationship in zip(path.join_keys(), path.join_relationships):
+                if key not in self._joins:
+                    target = relationship.property.mapper.class_
+                    self._joins[key] = (relationship, aliased(target))
+
+    @property
+    def join_paths(self) -> typing.List[str]:
+        """
+        Dotted names of planned joins in join order.
+        """
+        return [".".join([key[0].__name__, *key[1:]]) for key in self._joins]
+
+    def _get_entity(self, key: JoinKey):
+        if len(key) == 1:
+            return key[0]
+        _, alias = self._joins[key]
+        return alias
+
+    def apply_joins(self, base_stmt: Select) -> Select:
+        for key, (relationship, alias) in self._joins.items():
+            parent = self._get_entity(key[:-1])
+            base_stmt = base_stmt.outerjoin(
+                alias, getattr(parent, relationship.key).of_type(alias)
+            )
+        return base_stmt
+
+    def get_column(self, field_name: str):
+        """
+        Returns joined column of relationship field, e.g. for ordering.
+        Statement must be filtered with this plan.
+        """
+        path = self.paths.get(field_name, None)
+        if path is None or path.strategy is not RelationshipStrategy.JOIN:
+            raise ValueError(f"Field '{field_name}' is not planned as join")
+
+        return getattr(self._get_entity(path.join_keys()[-1]), path.column.key)
+
+    def resolve(self, field_name: str, query_field, build_condition: ConditionBuilder):
+        """
+        Build field condition against joined aliases or EXISTS subqueries.
+        """
+        path = query_field.relationship_path
+        if path is None:
+            return build_condition(query_field.model_field)
+
+        if self.paths.get(field_name, None) is not path:
+            raise ValueError(f"Relationship field '{field_name}' is not planned")
+
+        if not path.exists_relationships:
+            return build_condition(self.get_column(field_name))
+
+        keys = path.join_keys()
+        parent = self._get_entity(keys[-1] if keys else (path.root,))
+
+        first, *nested = path.exists_relationships
+        condition = build_condition(path.column)
+        for relationship in reversed(nested):
+            if relationship.property.uselist:
+                condition = relationship.any(condition)
+            else:
+                condition = relationship.has(condition)
+        return getattr(parent, first.key).any(condition)
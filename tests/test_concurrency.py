@@ -0,0 +1,186 @@
+"""
+Unittests for sharing compiled filter definition between threads and processes.
+"""
+import multiprocessing
+import os
+import time
+import typing
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import ForeignKey, select
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+
+from fastapi_query_filter import definition
+from fastapi_query_filter import (
+    BaseDeclarativeFilter,
+    CompiledFilter,
+    QueryType,
+    SqlQueryFilterFacade,
+)
+from fastapi_query_filter.definition import QueryField
+from fastapi_query_filter.types import QueryFilter, QueryFilterOperators
+
+THREADS = 8
+ITERATIONS = 200
+ROUNDS = 3
+THROUGHPUT_TOLERANCE = 0.5
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Author(Base):
+    __tablename__ = "author"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str]
+
+
+class Book(Base):
+    __tablename__ = "book"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    title: Mapped[str]
+    pages: Mapped[int]
+    author_id: Mapped[int] = mapped_column(ForeignKey("author.id"))
+    author: Mapped[Author] = relationship()
+
+
+class BookFilter(BaseDeclarativeFilter):
+    title = QueryField(Book.title, QueryType.Compare, str)
+    pages = QueryField(Book.pages, QueryType.Interval, int)
+    author = QueryField((Book.author, Author.name), QueryType.Compare, str)
+
+
+def make_queries(seed: int) -> typing.List[QueryFilter]:
+    return [
+        QueryFilter(field="title", operator=QueryFilterOperators.LIKE, value=f"t{seed}"),
+        QueryFilter(field="pages", operator=QueryFilterOperators.GE, value=seed),
+        QueryFilter(field="pages", operator=QueryFilterOperators.LE, value=seed + 100),
+        QueryFilter(field="author", operator=QueryFilterOperators.EQ, value=f"a{seed}"),
+    ]
+
+
+def render(seed: int) -> str:
+    facade = SqlQueryFilterFacade(BookFilter(), make_queries(seed))
+    stmt = facade.apply(select(Book.id))
+    return str(stmt.compile(compile_kwargs={"literal_binds": True}))
+
+
+def render_many(seeds: typing.Iterable[int]) -> typing.List[str]:
+    return [render(seed) for seed in seeds]
+
+
+def test_compiled_filter_is_shared_and_immutable():
+    compiled = BookFilter.compile()
+    assert BookFilter().query_fields is compiled.query_fields
+    assert set(compiled.query_fields) == {"title", "pages", "author"}
+
+    with pytest.raises(AttributeError):
+        compiled.query_fields = {}
+    with pytest.raises(TypeError):
+        compiled.query_fields["title"] = None  # type: ignore
+    with pytest.raises(TypeError):
+        SqlQueryFilterFacade._orm_operator_transformer[QueryFilterOperators.EQ] = None  # type: ignore
+
+
+def test_compile_from_many_threads():
+    class LazyFilter(BaseDeclarativeFilter):
+        title = QueryField(Book.title, QueryType.Compare, str)
+
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        results = list(executor.map(lambda _: LazyFilter.compile(), range(THREADS * 4)))
+
+    assert all(isinstance(compiled, CompiledFilter) for compiled in results)
+    assert len({id(compiled) for compiled in results}) == 1
+
+
+def test_apply_from_many_threads_is_deterministic():
+    seeds = [seed % 16 for seed in range(ITERATIONS)]
+    expected = render_many(seeds)
+
+    chunks = [seeds[index::THREADS] for index in range(THREADS)]
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        actual = list(executor.map(render_many, chunks))
+
+    assert actual == [expected[index::THREADS] for index in range(THREADS)]
+
+
+def measure_throughput(threads: int) -> float:
+    """
+    Returns best calls per second of rendering filtered statements in several threads.
+    """
+    chunks = [range(index, ITERATIONS, threads) for index in range(threads)]
+    best = 0.0
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for _ in range(ROUNDS):
+            started_at = time.perf_counter()
+            list(executor.map(render_many, chunks))
+            best = max(best, ITERATIONS / (time.perf_counter() - started_at))
+    return best
+
+
+def test_apply_throughput_scaling():
+    """
+    Applying filter is pure Python and CPU bound, so GIL serializes threads and ideal
+    throughput of N threads equals single thread one, it can't grow. Shared filter state
+    takes no locks on this path, so N threads must keep at least THROUGHPUT_TOLERANCE
+    of single thread throughput; lower value means contention or switching overhead.
+    Best of several rounds is compared to smooth out noise of busy runners.
+    """
+    render_many(range(16))  # warm up statement compilation caches
+
+    single_throughput = measure_throughput(1)
+    concurrent_throughput = measure_throughput(THREADS)
+
+    assert concurrent_throughput >= single_throughput * THROUGHPUT_TOLERANCE
+
+
+def _check_preloaded_filter(queue, preloaded_filter, lazy_filter, compiled):
+    def fail(cls):
+        raise AssertionError("Filter definition is built again in child")
+
+    BaseDeclarativeFilter._get_user_defined_fields = classmethod(fail)  # type: ignore
+    is_shared = preloaded_filter.compile() is compiled
+    try:
+        lazy_filter.compile()
+        is_lazy_built = True
+    except AssertionError:
+        is_lazy_built = False
+    queue.put((is_shared, is_lazy_built))
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="fork is not supported")
+def test_compile_before_fork():
+    """
+    Filter compiled before fork is inherited by child without building it again.
+    ``_compile_lock`` is held by parent at fork time, so lazy compilation in child
+    works only if child gets fresh lock.
+    """
+
+    class PreloadedFilter(BaseDeclarativeFilter):
+        title = QueryField(Book.title, QueryType.Compare, str)
+
+    class LazyFilter(BaseDeclarativeFilter):
+        title = QueryField(Book.title, QueryType.Compare, str)
+
+    compiled = PreloadedFilter.compile()
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    process = context.Process(
+        target=_check_preloaded_filter,
+        args=(queue, PreloadedFilter, LazyFilter, compiled),
+    )
+    with definition._compile_lock:
+        process.start()
+    process.join(timeout=10)
+    if process.is_alive():
+        process.kill()
+        pytest.fail("Child process is deadlocked")
+
+    assert process.exitcode == 0
+    is_shared, is_lazy_built = queue.get(timeout=1)
+    assert is_shared
+    assert not is_lazy_built
@@ -0,0 +1,239 @@
+"""
+Unittests for relationship-aware filtering.
+"""
+import typing
+
+import pytest
+from sqlalchemy import ForeignKey, create_engine, select
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    Mapped,
+    Session,
+    mapped_column,
+    relationship,
+)
+
+from fastapi_query_filter import (
+    BaseDeclarativeFilter,
+    QueryType,
+    RelationshipPath,
+    RelationshipStrategy,
+    SqlQueryFilterFacade,
+)
+from fastapi_query_filter.definition import QueryField
+from fastapi_query_filter.types import QueryFilter, QueryFilterOperators
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Country(Base):
+    __tablename__ = "country"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    code: Mapped[str]
+
+
+class Customer(Base):
+    __tablename__ = "customer"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str]
+    vip: Mapped[bool] = mapped_column(default=False)
+    country_id: Mapped[int] = mapped_column(ForeignKey("country.id"))
+    country: Mapped[Country] = relationship()
+
+
+class Order(Base):
+    __tablename__ = "order"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    customer_id: Mapped[int] = mapped_column(ForeignKey("customer.id"))
+    customer: Mapped[Customer] = relationship()
+    items: Mapped[typing.List["Item"]] = relationship()
+
+
+class Product(Base):
+    __tablename__ = "product"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str]
+
+
+class Item(Base):
+    __tablename__ = "item"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    order_id: Mapped[int] = mapped_column(ForeignKey("order.id"))
+    sku: Mapped[str]
+    gift: Mapped[bool] = mapped_column(default=False)
+    product_id: Mapped[typing.Optional[int]] = mapped_column(ForeignKey("product.id"))
+    product: Mapped[typing.Optional[Product]] = relationship()
+
+
+class OrderFilter(BaseDeclarativeFilter):
+    id = QueryField(Order.id, QueryType.Compare, int)
+    customer_name = QueryField((Order.customer, Customer.name), QueryType.Compare, str)
+    country = QueryField(
+        RelationshipPath.from_string(Order, "customer.country.code"),
+        QueryType.Compare,
+        str,
+    )
+    sku = QueryField((Order.items, Item.sku), QueryType.Compare, str)
+    product = QueryField((Order.items, Item.product, Product.name), QueryType.Compare, str)
+    vip = QueryField((Order.customer, Customer.vip), QueryType.Option, bool)
+    gift = QueryField((Order.items, Item.gift), QueryType.Option, bool)
+
+
+@pytest.fixture(scope="module")
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        ru, de = Country(id=1, code="RU"), Country(id=2, code="DE")
+        alice = Customer(id=1, name="alice", country=ru)
+        bob = Customer(id=2, name="bob", country=de, vip=True)
+        pen = Product(id=1, name="pen")
+        session.add_all(
+            [
+                Order(
+                    id=1,
+                    customer=alice,
+                    items=[Item(sku="a", product=pen), Item(sku="a", product=pen)],
+                ),
+                Order(id=2, customer=bob, items=[Item(sku="a"), Item(sku="b", gift=True)]),
+                Order(id=3, customer=alice, items=[]),
+            ]
+        )
+        session.commit()
+        yield session
+
+
+def make_facade(*queries: typing.Tuple[str, QueryFilterOperators, typing.Any]):
+    return SqlQueryFilterFacade(
+        OrderFilter(),
+        [QueryFilter(field=field, operator=op, value=value) for field, op, value in queries],
+    )
+
+
+def test_relationship_path_invalid():
+    with pytest.raises(ValueError):
+        RelationshipPath(Order.customer)
+    with pytest.raises(ValueError):
+        RelationshipPath(Order.id, Customer.name).resolve()
+    with pytest.raises(ValueError):
+        RelationshipPath(Order.customer, Item.sku).resolve()
+    with pytest.raises(ValueError):
+        RelationshipPath.from_string(Order, "customer.unknown").resolve()
+
+
+def test_relationship_path_is_resolved_lazily():
+    class LazyBase(DeclarativeBase):
+        pass
+
+    class Shelf(LazyBase):
+        __tablename__ = "shelf"
+
+        id: Mapped[int] = mapped_column(primary_key=True)
+        boxes: Mapped[typing.List["Box"]] = relationship()
+        labels = relationship("NotYetDefined")
+
+    class Box(LazyBase):
+        __tablename__ = "box"
+
+        id: Mapped[int] = mapped_column(primary_key=True)
+        shelf_id: Mapped[int] = mapped_column(ForeignKey("shelf.id"))
+
+    class ShelfFilter(BaseDeclarativeFilter):
+        box = QueryField((Shelf.boxes, Box.id), QueryType.Compare, int)
+        label = QueryField(RelationshipPath.from_string(Shelf, "labels.id"), QueryType.Compare, int)
+
+    class NotYetDefined(LazyBase):
+        __tablename__ = "label"
+
+        id: Mapped[int] = mapped_column(primary_key=True)
+        shelf_id: Mapped[int] = mapped_column(ForeignKey("shelf.id"))
+
+    query_fields = ShelfFilter.compile().query_fields
+    assert query_fields["box"].relationship_path.strategy is RelationshipStrategy.EXISTS
+    assert query_fields["label"].relationship_path.column is NotYetDefined.id
+
+
+def test_plan_reuses_shared_joins():
+    facade = make_facade(
+        ("id", QueryFilterOperators.GT, 0),
+        ("customer_name", QueryFilterOperators.EQ, "alice"),
+        ("country", QueryFilterOperators.EQ, "RU"),
+        ("sku", QueryFilterOperators.EQ, "a"),
+    )
+    plan = facade.plan()
+    assert plan.strategies == {
+        "id": RelationshipStrategy.COLUMN,
+        "customer_name": RelationshipStrategy.JOIN,
+        "country": RelationshipStrategy.JOIN,
+        "sku": RelationshipStrategy.EXISTS,
+    }
+    assert plan.join_paths == ["Order.customer", "Order.customer.country"]
+    assert facade.plan(exclude_fields={"country", "customer_name"}).join_paths == []
+
+
+def test_plan_get_column(session):
+    facade = make_facade(("customer_name", QueryFilterOperators.NOT_EQ, "nobody"))
+    assert isinstance(facade.fields["customer_name"], RelationshipPath)
+
+    plan = facade.plan()
+    stmt = facade.apply(select(Order.id), plan=plan)
+    stmt = stmt.order_by(plan.get_column("customer_name").desc(), Order.id)
+    assert session.scalars(stmt).all() == [2, 1, 3]
+
+    with pytest.raises(ValueError):
+        plan.get_column("sku")
+
+
+@pytest.mark.parametrize(
+    "queries",
+    [
+        [("customer_name", QueryFilterOperators.EQ, "alice")],
+        [("sku", QueryFilterOperators.EQ, "a")],
+        [("vip", QueryFilterOperators.OPTION, True)],
+    ],
+)
+def test_apply_with_mismatched_plan(queries):
+    facade = make_facade(*queries)
+    field_name = queries[0][0]
+    plan = facade.plan(exclude_fields={field_name})
+    with pytest.raises(ValueError, match=field_name):
+        facade.apply(select(Order.id), plan=plan)
+
+
+@pytest.mark.parametrize(
+    "queries,expected_ids",
+    [
+        ([("customer_name", QueryFilterOperators.EQ, "alice")], [1, 3]),
+        ([("country", QueryFilterOperators.EQ, "DE")], [2]),
+        (
+            [
+                ("customer_name", QueryFilterOperators.EQ, "alice"),
+                ("country", QueryFilterOperators.EQ, "RU"),
+            ],
+            [1, 3],
+        ),
+        ([("sku", QueryFilterOperators.EQ, "a")], [1, 2]),
+        (
+            [
+                ("sku", QueryFilterOperators.EQ, "a"),
+                ("country", QueryFilterOperators.EQ, "RU"),
+            ],
+            [1],
+        ),
+        ([("product", QueryFilterOperators.EQ, "pen")], [1]),
+        ([("product", QueryFilterOperators.NOT_EQ, "pen")], []),
+        ([("vip", QueryFilterOperators.OPTION, True)], [2]),
+        ([("vip", QueryFilterOperators.OPTION, False)], [1, 2, 3]),
+        ([("gift", QueryFilterOperators.OPTION, True)], [2]),
+    ],
+)
+def test_apply_relationship_filters(session, queries, expected_ids):
+    stmt = make_facade(*queries).apply(select(Order.id).order_by(Order.id))
+    assert session.scalars(stmt).all() == expected_ids